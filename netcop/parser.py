@@ -5,11 +5,142 @@ This Python library helps navigating and querying textual (CLI-style) configs of
 network devices.
 """
 
+import builtins
 import fnmatch
+import functools
 import re
+import socket
 import sys
-from ipaddress import ip_address, ip_network
-from typing import Dict, Iterator, List, Optional, Tuple
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network, ip_address, ip_network
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple, Union
+
+_WILD = frozenset("*?[")
+# chars of the comment, block and terminator tokens
+_SPECIAL = frozenset("#!{};")
+_IPV4_OCTET = r"(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])"
+_IPV4_RE = re.compile(r"\.".join([_IPV4_OCTET] * 4))
+# max number of memoized lookup results per node
+_LOOKUPS_MAX = 4096
+# shared copies of short lowercased tokens and line tails, cleared when they grow past _INTERN_MAX
+_TOKEN_INTERN: Dict[str, str] = {}
+_TAIL_INTERN: Dict[str, str] = {}
+_INTERN_MAX = 10000
+
+_Matcher = Callable[[str], Optional["re.Match[str]"]]
+
+
+@functools.lru_cache(maxsize=256)
+def _glob_re(pattern: str) -> _Matcher:
+    """
+    Compile the glob pattern into a bound regexp match method (cached)
+    """
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+def _ip_address(string: str) -> Union[IPv4Address, IPv6Address]:
+    """
+    ip_address() with a shortcut for the canonical dotted IPv4 form, the most common one
+    """
+    if _IPV4_RE.fullmatch(string):
+        return IPv4Address(socket.inet_aton(string))
+    return ip_address(string)
+
+
+def _split_token(string: str) -> Tuple[str, str, str]:
+    no_more = ("", "", "")
+    items = string.split(None, 1)
+    if not items:
+        return no_more
+    token = items[0]
+    if token in ("{", "}", "#", "!"):
+        return no_more
+    rest = ""
+    if len(items) == 2:
+        rest = items[1]
+        if len(rest) <= 32:
+            # short tails like 'ip redirects' repeat over many blocks; unlike sys.intern,
+            # the bounded table doesn't keep the unique ones (addresses, descriptions) forever
+            if len(_TAIL_INTERN) >= _INTERN_MAX:
+                _TAIL_INTERN.clear()
+            rest = _TAIL_INTERN.setdefault(rest, rest)
+    if token.endswith(";") and (rest == "" or rest.startswith(("#", "!"))):
+        token = token[:-1]
+    token_lc = token.lower()
+    if len(token_lc) < 32:
+        # index keys repeat across the whole tree, keep a single copy of each; values
+        # (addresses, names) get tokenized too, so the table has to be bounded
+        if len(_TOKEN_INTERN) >= _INTERN_MAX:
+            _TOKEN_INTERN.clear()
+        token_lc = _TOKEN_INTERN.setdefault(token_lc, token_lc)
+        if token == token_lc:
+            # keywords are mostly lowercase, share the interned copy with them
+            token = token_lc
+    return token_lc, token, rest
+
+
+_split_token_cached = functools.lru_cache(maxsize=4096)(_split_token)
+
+
+def _next_token(string: Optional[str]) -> Tuple[str, str, str]:
+    """
+    Split the string into (lowercased token, token, rest).
+    Results for short strings, which repeat a lot in query keys, are cached.
+    """
+    if not string:
+        return ("", "", "")
+    if len(string) < 128:
+        return _split_token_cached(string)
+    return _split_token(string)
+
+
+# trace of a node as a cons cell (parent trace, token), shared with the parent node
+_Trace = Optional[Tuple["_Trace", str]]
+
+
+# expand() query segment: lowercased token and its glob matcher, if it is a glob
+_Segment = Tuple[str, Optional[_Matcher]]
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_query(key: str) -> Optional[Tuple[_Segment, ...]]:
+    """
+    Split the expand() query into segments, compiling the globs once (cached)
+    Returns None if the query has no wildcards at all and is just a plain lookup.
+    """
+    segments: List[_Segment] = []
+    literal = True
+    rest = key
+    while rest:
+        token_lc, token, rest = _next_token(rest)
+        if not token:
+            break
+        if token == "~":
+            if rest:
+                raise ValueError("'~' should be the last token in query")
+            segments.append((token_lc, None))
+            literal = False
+        elif not _WILD.isdisjoint(token):
+            segments.append((token_lc, _glob_re(token_lc)))
+            literal = False
+        elif segments and segments[-1][1] is None and not segments[-1][0].endswith(";"):
+            # a run of plain keywords becomes a single multi-keyword lookup, up to
+            # a 'keyword;' which is stripped only as the last token of a lookup
+            segments[-1] = (segments[-1][0] + " " + token_lc, None)
+        else:
+            segments.append((token_lc, None))
+    return None if literal else tuple(segments)
+
+
+class _Entry(NamedTuple):
+    """
+    Index record of a line which follows a keyword, materialized to Conf on demand
+    """
+
+    rest: str
+    lineno: int
+    children: List["Conf"]
+    orig_line: str
 
 
 # ====
@@ -40,7 +171,17 @@ class Conf:
         conf['interface']['Ethernet1/0/1']['ip']['address']
     """
 
-    __slots__ = ("_line", "_orig_line", "_lineno", "_trace", "_children", "_index")
+    __slots__ = (
+        "_line",
+        "_orig_line",
+        "_lineno",
+        "_trace",
+        "_trace_str",
+        "_children",
+        "_index",
+        "_token",
+        "_lookups",
+    )
 
     def __init__(self, text: str = "", lines: Optional[List[str]] = None):
         """
@@ -50,9 +191,12 @@ class Conf:
         self._line: Optional[str] = None
         self._orig_line: str = ""
         self._lineno = 0
-        self._trace: Tuple[str, ...] = ()
+        self._trace: _Trace = None
+        self._trace_str: Optional[str] = None
         self._children: List[Conf] = []
-        self._index: Dict[str, Tuple[str, List[Conf]]] = {}
+        self._index: Optional[Dict[str, Tuple[str, List[_Entry]]]] = None
+        self._token: Optional[Tuple[str, str, str]] = None
+        self._lookups: Optional[Dict[str, Conf]] = None
         if text:
             self._parse(text.splitlines())
         elif lines:
@@ -61,62 +205,65 @@ class Conf:
             self._line = ""
 
     @classmethod
-    def _new(cls, line, lineno, children=(), orig_line=None) -> "Conf":
-        ret = cls()
+    def _new(
+        cls,
+        line: Optional[str],
+        lineno: int,
+        children: Optional[List["Conf"]] = None,
+        orig_line: Optional[str] = None,
+    ) -> "Conf":
+        # bypass __init__ and fill all the slots directly, as it runs per config line
+        ret = cls.__new__(cls)
         ret._line = line
         ret._orig_line = orig_line or line or ""
         ret._lineno = lineno
-        ret._children = list(children)
+        ret._trace = None
+        ret._trace_str = None
+        # the tree is never modified after parsing, so children lists are shared
+        ret._children = [] if children is None else children
+        ret._index = None
+        ret._token = None
+        ret._lookups = None
         return ret
 
     def _parse(self, lines: List[str]) -> None:
-        stack = [(self, "")]
+        # parallel stacks of the open blocks and their indents, the root's indent
+        # is below any line's, so it is never popped
+        nodes: List[Conf] = [self]
+        indents: List[int] = [-1]
+        # bind to locals to save attribute lookups in the per-line loop
+        new_node = self._new
+        push_node, pop_node = nodes.append, nodes.pop
+        push_indent, pop_indent = indents.append, indents.pop
 
         for lineno, line in enumerate(lines):
             line = line.rstrip()
-            m = re.match(r"(\s*)", line)
-            if not m:
-                # if is used to avoid unnesessary string formatting
-                assert m, "regexp must always match, line %r" % line
-            indent = m.group(1)
-            if line == indent:
+            indent = len(line) - len(line.lstrip())
+            if indent == len(line):
                 continue
-            node = Conf._new(line, lineno)
-            if len(indent) > len(stack[-1][1]):
-                stack[-1][0]._children.append(node)
-                stack.append((node, indent))
-            else:
-                while len(indent) <= len(stack[-1][1]) and stack[-1][0] is not self:
-                    stack.pop()
-                stack[-1][0]._children.append(node)
-                stack.append((node, indent))
-
-    @staticmethod
-    def _next_token(string):
-        no_more = ("", "", "")
-        if not string:
-            return no_more
-        items = string.split(None, 1)
-        if not items:
-            return no_more
-        token = items[0]
-        if token in ("{", "}", "#", "!"):
-            return no_more
-        rest = ""
-        if len(items) == 2:
-            rest = items[1]
-        if token.endswith(";") and (rest == "" or rest.startswith(("#", "!"))):
-            token = token[:-1]
-        return token.lower(), token, rest
+            node = new_node(line, lineno)
+            while indent <= indents[-1]:
+                pop_node()
+                pop_indent()
+            nodes[-1]._children.append(node)
+            push_node(node)
+            push_indent(indent)
 
     @property
-    def trace(self):
+    def trace(self) -> str:
         """
         Get the string index of the node agaisnt root of the tree
         """
-        return " ".join(self._trace)
+        if self._trace_str is None:
+            tokens = []
+            cell = self._trace
+            while cell:
+                cell, token = cell
+                tokens.append(token)
+            self._trace_str = " ".join(reversed(tokens))
+        return self._trace_str
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         fmt_line = ""
         if self._line:
             fmt_line = repr(self._line)
@@ -125,7 +272,12 @@ class Conf:
             ret += "[%r]" % self.trace
         return ret
 
-    def dump(self, file=None, indent="  ", show_header=True):
+    def dump(
+        self,
+        file: Optional[TextIO] = None,
+        indent: Optional[str] = "  ",
+        show_header: bool = True,
+    ) -> None:
         """
         Write the indented config subtree to a given file
         sys.stdout is used if file argument is unspecified.
@@ -134,25 +286,43 @@ class Conf:
             return
         if file is None:
             file = sys.stdout
+        file.write(self.dumps(indent, show_header))
 
-        def _put_line(line, level):
-            if indent is None:
-                file.write(line + "\n")
-            else:
-                file.write((indent * level) + line.strip() + "\n")
+    def dumps(self, indent: Optional[str] = "  ", show_header: bool = True) -> str:
+        """
+        Get the indented config subtree as a string, just like .dump() writes it
+        """
+        if self._line is None:
+            return ""
 
+        parts = []
         if self._trace and show_header:
-            file.write("[%s]" % (self.trace))
-            file.write("\n" if not self._line else " ")
+            parts.append("[%s]" % (self.trace))
+            parts.append("\n" if not self._line else " ")
 
+        # indents for each level are built once and shared by all the lines
+        prefixes: Dict[builtins.int, str] = {}
         for line, level in self._iter_lines(-1, False):
-            _put_line(line, level)
-
-    def _iter_lines(self, depth, orig_lines):
-        if self._line:
-            yield (self._orig_line if orig_lines else self._line), depth
-        for c in self._children:
-            yield from c._iter_lines(depth + 1, orig_lines)
+            if indent is None:
+                parts.append(line)
+            else:
+                prefix = prefixes.get(level)
+                if prefix is None:
+                    prefix = prefixes[level] = indent * level
+                parts.append(prefix)
+                parts.append(line.strip())
+            parts.append("\n")
+
+        return "".join(parts)
+
+    def _iter_lines(self, depth: builtins.int, orig_lines: bool) -> Iterator[Tuple[str, builtins.int]]:
+        stack = [(self, depth)]
+        while stack:
+            node, level = stack.pop()
+            if node._line:
+                yield (node._orig_line if orig_lines else node._line), level
+            if node._children:
+                stack.extend(zip(reversed(node._children), repeat(level + 1)))
 
     def lines(self) -> List[str]:
         """
@@ -166,38 +336,53 @@ class Conf:
         """
         return [line for line, _ in self._iter_lines(0, True)]
 
-    def _ensure_scalar(self):
-        self._reindex()
-        if len(self._index) == 0:
+    def _ensure_scalar(self) -> str:
+        index = self._reindex()
+        if len(index) == 0:
             raise KeyError(
                 "No entries in node [%r], line %d" % (self.trace, self._lineno)
             )
-        if len(self._index) > 1:
+        if len(index) > 1:
             raise KeyError(
                 "Multiple entries (%d) match the key [%r], line %d"
                 % (
-                    len(self._index),
+                    len(index),
                     self.trace,
                     self._lineno,
                 )
             )
-        return next(iter(self._index))
-
-    def _reindex(self):
-        if self._index:
-            return
-        index = {}
-        token_lc, token, rest = self._next_token(self._line)
+        return next(iter(index))
+
+    def _reindex(self) -> Dict[str, Tuple[str, List[_Entry]]]:
+        if self._index is not None:
+            return self._index
+        index: Dict[str, Tuple[str, List[_Entry]]] = {}
+        split = self._token
+        if split is None:
+            split = self._token = _split_token(self._line or "")
+        token_lc, token, rest = split
         if token:
-            new = Conf._new(rest, self._lineno, self._children, self._orig_line)
-            index[token_lc] = (token, [new])
+            entry = _Entry(rest, self._lineno, self._children, self._orig_line)
+            index[token_lc] = (token, [entry])
         else:
             for c in self._children:
-                token_lc, token, rest = self._next_token(c._line)
+                # children are shared by all the nodes derived from the same parent,
+                # so their lines are split only once, and bypass the LRU: every line
+                # would miss it, only to evict some query key
+                split = c._token
+                if split is None:
+                    split = c._token = _split_token(c._line or "")
+                token_lc, token, rest = split
                 if token:
-                    new = Conf._new(rest, c._lineno, c._children, c._orig_line)
-                    index.setdefault(token_lc, (token, []))[1].append(new)
+                    entry = _Entry(rest, c._lineno, c._children, c._orig_line)
+                    # unlike setdefault(), allocates the pair only for a new keyword
+                    pair = index.get(token_lc)
+                    if pair is None:
+                        index[token_lc] = (token, [entry])
+                    else:
+                        pair[1].append(entry)
         self._index = index
+        return index
 
     def expand(self, key: str, return_conf: bool = False) -> Iterator[Tuple]:
         """
@@ -222,117 +407,161 @@ class Conf:
             else:
                 yield ()
             return
-        self._reindex()
-        _, token, rest = self._next_token(key)
-        if token == "~":
-            if rest:
-                raise ValueError("'~' should be the last token in query")
-            if self._line:
-                yield (
-                    self._line.strip(),
-                    self._expand_cfg(self.trace + " " + self._line),
-                ) if return_conf else (self._line.strip(),)
-            else:
-                for c in self._children:
+        segments = _compile_query(key)
+        if segments is None:
+            # no wildcards, the whole key is a plain lookup
+            node = self[key]
+            if node:
+                yield (node,) if return_conf else ()
+            return
+        yield from self._expand(segments, return_conf)
+
+    def _expand(self, segments: Tuple[_Segment, ...], return_conf: bool) -> Iterator[Tuple]:
+        # depth-first walk with an explicit stack of (node, segment position, captures),
+        # nodes are pushed in reverse to be yielded in the config order
+        stack: List[Tuple[Conf, builtins.int, Tuple[str, ...]]] = [(self, 0, ())]
+        end = len(segments)
+        while stack:
+            node, pos, captured = stack.pop()
+            if pos == end:
+                yield (*captured, node) if return_conf else captured
+                continue
+            token_lc, match = segments[pos]
+            if token_lc == "~":
+                for c in (node,) if node._line else node._children:
                     assert c._line
-                    yield (
-                        c._line.strip(),
-                        c._expand_cfg(self.trace + " " + c._line),
-                    ) if return_conf else (c._line.strip(),)
-        elif any(x in token for x in "*?["):
-            for k in fnmatch.filter(self, token):
-                for ret in self[k].expand(rest, return_conf):
-                    yield (k, *ret)
-        elif self[token]:
-            for ret in self[token].expand(rest, return_conf):
-                yield ret
-
-    def _expand_cfg(self, trace_str: str) -> "Conf":
+                    if return_conf:
+                        yield (*captured, c._line.strip(), c._expand_cfg(node._trace, c._line))
+                    else:
+                        yield (*captured, c._line.strip())
+            elif match:
+                keys = [x[0] for k_lc, x in node._reindex().items() if match(k_lc)]
+                # not memoized: a fan-out over every child would keep them all alive
+                stack.extend((node._lookup(k), pos + 1, (*captured, k)) for k in reversed(keys))
+            else:
+                child = node[token_lc]
+                if child:
+                    stack.append((child, pos + 1, captured))
+
+    def _expand_cfg(self, trace: _Trace, line: str) -> "Conf":
         ret = self._new(
             None if not self._children else "",
             self._lineno,
             self._children,
             self._orig_line,
         )
-        ret._trace = tuple(trace_str.split())
+        for token in line.split():
+            trace = (trace, token)
+        ret._trace = trace
         return ret
 
     # ==== dict-like API
     def __getitem__(self, key: str) -> "Conf":
-        token_lc, _, rest = self._next_token(key)
-        if not token_lc:
-            return self
-        self._reindex()
-        pair = self._index.get(token_lc)
-        if not pair:
-            return Conf()
-        token, ret_list = pair
+        # the tree is immutable, so the results of the lookups are memoized per node
+        lookups = self._lookups
+        if lookups is None:
+            lookups = self._lookups = {}
+        else:
+            ret = lookups.get(key)
+            if ret is not None:
+                return ret
+        ret = self._lookup(key)
+        if ret is not self:
+            if len(lookups) >= _LOOKUPS_MAX:
+                lookups.clear()
+            lookups[key] = ret
+        return ret
 
-        if len(ret_list) == 1:
-            ret = ret_list[0]
+    def _lookup(self, key: str) -> "Conf":
+        index = self._reindex()
+        # fast path for a single lowercase keyword, the most common kind of key
+        pair = index.get(key)
+        if pair is not None and not key.endswith(";"):
+            rest = ""
         else:
-            # ret_list can not be empty
-            ret = Conf._new("", ret_list[0]._lineno, ret_list, ret_list[0]._orig_line)
+            token_lc, _, rest = _next_token(key)
+            if not token_lc:
+                return self
+            pair = index.get(token_lc)
+            if not pair:
+                return _EMPTY
+        token, entries = pair
+
+        if len(entries) == 1:
+            ret = Conf._new(*entries[0])
+        else:
+            # entries can not be empty
+            ret = Conf._new(
+                "",
+                entries[0].lineno,
+                [Conf._new(*e) for e in entries],
+                entries[0].orig_line,
+            )
 
-        ret._trace = (*self._trace, token)
+        ret._trace = (self._trace, token)
 
         if rest:
-            return ret[rest]
+            # the outer __getitem__ memoizes the final result, not the intermediate nodes
+            return ret._lookup(rest)
         return ret
 
-    def __iter__(self):
+    def __iter__(self) -> Iterator[str]:
         """
         Get the sequence of unique keywords following the node
         """
-        self._reindex()
-        return (x[0] for x in self._index.values())
+        return (x[0] for x in self._reindex().values())
 
-    def __len__(self):
+    def __len__(self) -> builtins.int:
         """
         Number of the unique keywords following the node
         """
-        self._reindex()
-        return len(self._index)
+        return len(self._reindex())
 
-    def __contains__(self, key):
+    def __contains__(self, key: str) -> bool:
         """
         Whether the [key] operator return a non-empty node
         """
-        self._reindex()
+        if key in self._reindex() and not key.endswith(";"):
+            return True
         return bool(self[key])
 
-    def __bool__(self):
+    def __bool__(self) -> bool:
         """
         Whether the node is empty
         """
         return self._line is not None
 
-    def __nonzero__(self):
+    def __nonzero__(self) -> bool:
         return self.__bool__()
 
-    def items(self):
+    def items(self) -> Iterator[Tuple[str, "Conf"]]:
         """
         Get a sequence of (key, value) pairs just as with dict.
         keys are direct descendant strings, values are Conf subtrees
         """
         self._reindex()
-        return ((k, self[k]) for k in self)
+        # not memoized, like the expand() fan-out
+        return ((k, self._lookup(k)) for k in self)
 
-    def keys(self):
+    def keys(self) -> Iterator[str]:
         """
         Get a sequence of direct descendant strings just as with dict.
         """
         self._reindex()
         return (x for x in self)
 
-    def values(self):
+    def values(self) -> Iterator[List["Conf"]]:
         """
         Get a sequence of Conf subtrees
         """
-        self._reindex()
-        return (x[1] for x in self._index.values())
+        return ([Conf._new(*e) for e in x[1]] for x in self._reindex().values())
 
-    def get(self, key, default=None, type=None):
+    def get(
+        self,
+        key: str,
+        default: Any = None,
+        type: Optional[Callable[[str], Any]] = None,
+    ) -> Any:
         """
         Get the following keyword by the given path (key)
         Optinal arguments are the default value and type convertion procedure.
@@ -347,7 +576,7 @@ class Conf:
 
     # ==== scalar API
     @property
-    def word(self):
+    def word(self) -> str:
         """
         Get the single following keyword.
         In case there is no one or there are multiple ones, a KeyError is raised.
@@ -355,27 +584,36 @@ class Conf:
         return self._ensure_scalar()
 
     @property
-    def tail(self):
+    def tail(self) -> str:
         """
         Get the following keywords in the config line as a single string.
         In case there is no single assosiated line one or there are multiple ones, a
         KeyError is raised.
         """
         self._ensure_scalar()
+        assert self._line is not None
+        words = self._line.split()
+        if _SPECIAL.isdisjoint(self._line):
+            # no comments, braces or semicolons, all the words are the tail
+            return " ".join(words)
+        # the same rules as in _split_token, applied in a single pass over the words
+        last = len(words) - 1
         items = []
-        rest = self._line
-        while rest:
-            _, token, rest = self._next_token(rest)
-            if token:
-                items.append(token)
+        for i, word in enumerate(words):
+            if word in ("{", "}", "#", "!"):
+                break
+            if word.endswith(";") and (i == last or words[i + 1].startswith(("#", "!"))):
+                word = word[:-1]
+            if word:
+                items.append(word)
         return " ".join(items)
 
     @property
-    def tails(self):
+    def tails(self) -> List[str]:
         return [x for x, in self.expand("~")]
 
     @property
-    def quoted(self):
+    def quoted(self) -> str:
         """
         Get the quoted string (without surrounding quotes) directly following the node.
         If there is no quoted string following, returns just the next keyword,
@@ -384,20 +622,20 @@ class Conf:
         a KeyError is raised.
         """
         self._ensure_scalar()
-        assert self._line is not None
-        quote_char = self._line[:1]
-        try:
-            if quote_char in ['"', "'"]:
-                return self._line[1 : self._line.index(quote_char, 1)]
-        except ValueError:
-            raise ValueError(
-                "No ending <%s> found in [%r], line %d: %r"
-                % (quote_char, self.trace, self._lineno, self._line)
-            )
+        line = self._line
+        assert line is not None
+        if line.startswith(('"', "'")):
+            end = line.find(line[0], 1)
+            if end < 0:
+                raise ValueError(
+                    "No ending <%s> found in [%r], line %d: %r"
+                    % (line[0], self.trace, self._lineno, line)
+                )
+            return line[1:end]
         return next(iter(self))
 
     @property
-    def int(self):
+    def int(self) -> builtins.int:
         """
         Get the single following keyword casted to int.
         In case there is no one or there are multiple ones, a KeyError is raised.
@@ -405,7 +643,7 @@ class Conf:
         return int(self.word)
 
     @property
-    def ints(self):
+    def ints(self) -> List[builtins.int]:
         """
         Get the list of all following keywords casted to int.
         TypeError may be raised in case there is a keyword that can not be casted.
@@ -413,7 +651,7 @@ class Conf:
         return [int(x) for x in self]
 
     @property
-    def lineno(self):
+    def lineno(self) -> builtins.int:
         """
         Get the number of the line in initial config text
         KeyError may be raised in case there is no corresponding line
@@ -422,7 +660,7 @@ class Conf:
         return self._lineno
 
     @property
-    def junos_list(self):
+    def junos_list(self) -> List[str]:
         """
         Get the list of following keywords surrounded in [ ]
         If there is no surrounding [ ], return the list of the single keyword that
@@ -436,40 +674,43 @@ class Conf:
                 return items[1:-1]
         return [self.word]
 
-    if "ip_address" in globals():
-
-        @property
-        def ip(self):
-            """
-            Get the single following ip as an IPAddress object.
-            In case there is no one or there are multiple ones, a KeyError is raised.
-            TypeError may be raised in case there is a keyword that can not be casted to
-            the IPAddress type.
-            """
-            return ip_address(self.word)
-
-        @property
-        def ips(self):
-            """
-            Get the list of all following keywords casted to IPAddress.
-            TypeError may be raised in case there is a keyword that can not be casted.
-            """
-            return [ip_address(x) for x in self]
-
-        @property
-        def cidr(self):
-            """
-            Get the single following IP network as an IPNetwork object.
-            In case there is no one or there are multiple ones, a KeyError is raised.
-            TypeError may be raised in case there is a keyword that can not be casted to
-            the IPNetwork type.
-            """
-            return ip_network(self.word)
-
-        @property
-        def cidrs(self):
-            """
-            Get the list of all following keywords casted to IPNetwork.
-            TypeError may be raised in case there is a keyword that can not be casted.
-            """
-            return [ip_network(x) for x in self]
+    @property
+    def ip(self) -> Union[IPv4Address, IPv6Address]:
+        """
+        Get the single following ip as an IPAddress object.
+        In case there is no one or there are multiple ones, a KeyError is raised.
+        TypeError may be raised in case there is a keyword that can not be casted to
+        the IPAddress type.
+        """
+        return _ip_address(self.word)
+
+    @property
+    def ips(self) -> List[Union[IPv4Address, IPv6Address]]:
+        """
+        Get the list of all following keywords casted to IPAddress.
+        TypeError may be raised in case there is a keyword that can not be casted.
+        """
+        return [_ip_address(x) for x in self]
+
+    @property
+    def cidr(self) -> Union[IPv4Network, IPv6Network]:
+        """
+        Get the single following IP network as an IPNetwork object.
+        In case there is no one or there are multiple ones, a KeyError is raised.
+        TypeError may be raised in case there is a keyword that can not be casted to
+        the IPNetwork type.
+        """
+        return ip_network(self.word)
+
+    @property
+    def cidrs(self) -> List[Union[IPv4Network, IPv6Network]]:
+        """
+        Get the list of all following keywords casted to IPNetwork.
+        TypeError may be raised in case there is a keyword that can not be casted.
+        """
+        return [ip_network(x) for x in self]
+
+
+# the result of all the missed lookups, any lookup in it returns itself; only its lazy
+# caches (_index, _lookups, _trace_str) get filled, it never changes in a way callers can see
+_EMPTY = Conf()
@@ -13,6 +13,7 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/andriyanov/netcop",
     packages=["netcop"],
+    python_requires=">=3.8",
     classifiers=[
         "Programming Language :: Python",
         "License :: OSI Approved :: MIT License",
@@ -3,7 +3,7 @@
 from io import StringIO
 from ipaddress import ip_address
 
-from pytest import fixture
+from pytest import fixture, raises
 
 from netcop import Conf
 
@@ -248,8 +248,7 @@ def test_junos(jconf: Conf):
     f_o = jconf["forwarding-options"]
     assert f_o["sampling input rate"].int == 1
     assert f_o["family inet"]
-    if "ip_address" in globals():
-        assert f_o["family inet output flow-server"].ips == [ip_address("10.60.2.1")]
+    assert f_o["family inet output flow-server"].ips == [ip_address("10.60.2.1")]
 
     assert f_o["family inet output apply-groups"].junos_list == ["one", "two", "three"]
     assert f_o["sampling input rate"].junos_list == ["1"]
@@ -264,6 +263,10 @@ def test_expand(conf: Conf):
 
     assert list(conf.expand("interface * ip blah *")) == []
 
+    assert list(conf.expand("interface if1 ip address 1.1.1.1")) == [()]
+    assert list(conf.expand("interface if3 ip address")) == []
+    assert [c.trace for c, in conf.expand("interface if1 ip", True)] == ["interface IF1 ip"]
+
     # assert list(conf.expand('interface')) == [(), ()]
 
 
@@ -276,6 +279,11 @@ def test_expand2(conf: Conf):
 
     assert list(conf.expand("interface * ip blah ~")) == []
 
+    with raises(ValueError):
+        list(conf.expand("interface ~ ip"))
+    with raises(ValueError):
+        list(conf.expand("blah ~ ip"))
+
     assert conf["interface IF1 ip"].tails == [
         "address 1.1.1.1",
         "address 2.2.2.2 secondary",
@@ -331,3 +339,103 @@ def test_lines(conf: Conf):
         '    description hello world',
         '    long-description "hello world" end',
     ]
+
+
+def test_expand_case(conf: Conf):
+    assert list(conf.expand("interface if* ip address *")) == list(conf.expand("interface IF* ip address *"))
+    assert list(conf.expand("INTERFACE i?2 ip address *")) == [("IF2", "1.1.1.2")]
+
+
+def test_quoted():
+    conf = Conf(
+        """
+description 'single quoted' tail
+name unquoted word
+broken "no end
+"""
+    )
+    assert conf["description"].quoted == "single quoted"
+    assert conf["name"].quoted == "unquoted"
+    with raises(ValueError):
+        conf["broken"].quoted
+
+
+def test_semicolon_key():
+    conf = Conf("a; b\nc 1;\n")
+    # a trailing semicolon is only stripped from the last keyword of the key
+    assert conf["a; b"]
+    assert "a; b" in conf
+    assert not conf["a;"]
+    assert "a;" not in conf
+    assert conf["c 1;"]
+    assert "c 1;" in conf
+
+
+def test_expand_semicolon_key():
+    # 'a;' is stripped as it is the last keyword of its own lookup
+    assert list(Conf("a b x\n").expand("a; b *")) == [("x",)]
+    assert list(Conf("a; b x\n").expand("a; b *")) == []
+    assert list(Conf("a b x\n").expand("a b; *")) == [("x",)]
+
+
+def test_expand_return_conf(conf: Conf):
+    assert [(ifname, c.trace) for ifname, _, c in conf.expand("interface * ip address *", True)] == [
+        ("IF1", "interface IF1 ip address 1.1.1.1"),
+        ("IF1", "interface IF1 ip address 2.2.2.2"),
+        ("IF2", "interface IF2 ip address 1.1.1.2"),
+    ]
+    assert [c.trace for _, c in conf.expand("interface IF1 stp ~", True)] == [
+        "interface IF1 stp more stp",
+    ]
+
+
+def test_slots(conf: Conf):
+    assert not hasattr(Conf(), "__dict__")
+    assert not hasattr(conf["interface if1 ip"], "__dict__")
+
+
+def test_lookup_memo(conf: Conf):
+    iface = conf["interface"]
+    assert iface is conf["interface"]
+    assert iface["if1"] is iface["if1"]
+    assert iface["if1"].trace == iface["IF1"].trace == "interface IF1"
+    assert not conf["interface if3"]
+    assert not conf["interface if3"]
+
+
+def test_missing(conf: Conf):
+    assert not conf["blah"]
+    assert not conf["blah"]["more"]
+    assert "more" not in conf["blah"]
+    assert repr(conf["blah more"]) == "Conf()"
+    assert list(conf["blah"]) == []
+
+
+def test_ips():
+    conf = Conf(
+        """
+ip address 10.0.0.1
+ip address 2001:db8::1
+ipv4 address 010.0.0.1
+"""
+    )
+    assert conf["ip address"].ips == [ip_address("10.0.0.1"), ip_address("2001:db8::1")]
+    with raises(ValueError):
+        conf["ipv4 address"].ip
+
+
+def test_dumps(conf: Conf, jconf: Conf):
+    for c in (conf, conf["interface if1"], conf["stp"], jconf):
+        buff = StringIO()
+        c.dump(file=buff, indent="    ")
+        assert c.dumps(indent="    ") == buff.getvalue()
+    assert conf["stp"].dumps(show_header=False) == "mode mstp 1\n"
+    assert conf["blah"].dumps() == ""
+
+
+def test_expand_no_memo(conf: Conf):
+    iface = conf["interface"]
+    assert list(conf.expand("interface * ip address *"))
+    assert not iface._lookups
+    assert len(list(iface.items())) == len(iface)
+    assert not iface._lookups